@@ -34,7 +34,9 @@ def main():
             return
 
         # get page count
-        max_pages_input = input("\nMax pages to parse (Enter for 200): ").strip()
+        max_pages_input = input(
+            "\nMax pages to parse, 50 comments each (Enter for 200): "
+        ).strip()
         max_pages = 200 if not max_pages_input else int(max_pages_input)
 
         # create parser instance
@@ -46,11 +48,11 @@ def main():
         print("STARTING PARSING")
         print("=" * 60)
 
-        comments_data = parser.parse_profile(profile_url, max_pages=max_pages)
+        parser.parse_profile(profile_url, max_pages=max_pages)
 
         elapsed_time = time.time() - start_time
 
-        if not comments_data:
+        if not parser.total_comments:
             print("\n❌ Failed to get comments. Check URL and try again.")
             return
 
@@ -81,17 +83,7 @@ def main():
         show_example = input("\nShow sample data? (y/n): ").lower().strip()
         if show_example == "y":
             print("\nSample data structure (first 3 commenters):")
-            sample_data = {}
-            count = 0
-            for user, data in parser.comments_data.items():
-                if data["comments"]:
-                    sample_data[user] = {
-                        "count": data["count"],
-                        "comments": data["comments"][:1],
-                    }
-                    count += 1
-                    if count >= 3:
-                        break
+            sample_data = parser.group_by_user(max_users=3, max_comments=1)
 
             print(json.dumps(sample_data, ensure_ascii=False, indent=2))
 
@@ -1,13 +1,244 @@
-import json
+import orjson
 import re
-from collections import defaultdict
-from bs4 import BeautifulSoup
+from collections import Counter
+from contextlib import nullcontext
+from itertools import islice
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
-from typing import Dict, Any, Optional
-import time
+from typing import Dict, Any, FrozenSet, List, Optional, Union
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from urllib.parse import urljoin, urlparse, parse_qs, urlencode
 import math
+import multiprocessing
+import time
+import hashlib
+import os
+import sys
+
+# CSS selectors for comment markup
+_CSS_COMMENT_BLOCKS = "div.commentthread_comment"
+_CSS_COMMENT_BLOCKS_FALLBACK = 'div[class*="comment"]'
+_CSS_AUTHOR_LINK = "a.commentthread_author_link"
+_CSS_PROFILE_LINK = 'a[href*="/profiles/"], a[href*="/id/"]'
+_CSS_COMMENT_TEXT = "div.commentthread_comment_text"
+_CSS_COMMENT_TEXT_FALLBACK = 'div[class*="text"]'
+_CSS_TIMESTAMP = "span.commentthread_comment_timestamp"
+_CSS_TIMESTAMP_FALLBACK = 'span[class*="timestamp"]'
+_CSS_AVATAR_FASTLY = 'img[src*="avatars.fastly.steamstatic.com"]'
+_CSS_AVATAR_ANY = 'img[src*="steamstatic.com"]'
+_CSS_AVATAR_DIV = (
+    'div[class*="commentthread_comment_avatar"], div[class*="playerAvatar"]'
+)
+_CSS_ALL_COMMENTS_LINK = "a.commentthread_allcommentslink"
+_CSS_TOTALCOUNT = '[id*="totalcount"]'
+
+_RE_PROFILE_ID = re.compile(r"/profiles/(\d+)")
+_RE_VANITY = re.compile(r"/id/([^/]+)")
+_RE_PROFILE_DATA = re.compile(r"g_rgProfileData\s*=\s*({[^}]+})")
+
+# export column order, also the layout of parsed comment rows
+_COMMENT_FIELDS = (
+    "user",
+    "steam_id",
+    "profile_url",
+    "comment_text",
+    "timestamp",
+    "avatar_url",
+    "status",
+    "comment_id",
+    "parsed_time",
+)
+_COMMENT_ID_INDEX = _COMMENT_FIELDS.index("comment_id")
+_INTERN_MASK = tuple(
+    field in ("user", "steam_id", "profile_url", "avatar_url")
+    for field in _COMMENT_FIELDS
+)
+
+
+def _seen_key(comment_id: str):
+    """dedup key: steam ids are numeric, an int is a fraction of the str size"""
+    return int(comment_id) if comment_id.isdigit() else comment_id
+
+
+def _text(node: LexborNode) -> str:
+    """node text with each text node stripped, like bs4 get_text(strip=True)"""
+    return node.text(strip=True)
+
+
+def _response_html(response: requests.Response) -> Union[str, bytes]:
+    """
+    Page body for LexborHTMLParser
+
+    Lexbor decodes bytes as UTF-8 and ignores declared charsets, so raw
+    bytes (no decode/copy) are passed only when requests reports UTF-8
+    or no encoding at all. Everything else, including text/html without
+    a charset (which requests treats as ISO-8859-1), goes through
+    response.text like the original code did.
+    """
+    encoding = (response.encoding or "utf-8").lower().replace("_", "-")
+    if encoding in ("utf-8", "utf8"):
+        return response.content
+    return response.text
+
+
+def _find_comment_blocks(tree: LexborHTMLParser) -> List[LexborNode]:
+    """comment blocks of a page"""
+    comment_blocks = tree.css(_CSS_COMMENT_BLOCKS)
+
+    # fallback for alternative class names
+    if not comment_blocks:
+        comment_blocks = tree.css(_CSS_COMMENT_BLOCKS_FALLBACK)
+
+    return comment_blocks
+
+
+def parse_page(
+    html_content: Union[str, bytes], skip_ids: FrozenSet = frozenset()
+) -> List[tuple]:
+    """
+    Parse one page of comment HTML into rows
+
+    Module-level and free of parser state so pages can be parsed in
+    worker processes; deduplication happens when rows are merged.
+    Blocks whose id is in skip_ids (dedup keys) are not parsed at all.
+    """
+    if not html_content.strip():
+        return []
+
+    return _parse_tree(LexborHTMLParser(html_content), skip_ids)
+
+
+def _parse_tree(
+    tree: LexborHTMLParser, skip_ids: FrozenSet = frozenset()
+) -> List[tuple]:
+    """rows of all comment blocks of a parsed page"""
+    # parse time, shared by the whole page
+    parsed_time = datetime.now().isoformat()
+
+    rows = []
+    for comment in _find_comment_blocks(tree):
+        # skip known comments by their id attribute before the full parse
+        if skip_ids:
+            block_id = comment.attributes.get("id") or ""
+            if block_id.startswith("comment_"):
+                if _seen_key(block_id[len("comment_") :]) in skip_ids:
+                    continue
+
+        row = _parse_single_comment(comment, parsed_time)
+        if row:
+            rows.append(row)
+
+    return rows
+
+
+def _parse_single_comment(
+    comment_element: LexborNode, parsed_time: str
+) -> Optional[tuple]:
+    """parse single comment element into a row in _COMMENT_FIELDS order"""
+    try:
+        # username
+        user_link = comment_element.css_first(_CSS_AUTHOR_LINK)
+        if user_link is None:
+            user_link = comment_element.css_first(_CSS_PROFILE_LINK)
+            if user_link is None:
+                return None
+
+        user_name = _text(user_link)
+
+        # profile URL
+        user_profile_link = user_link.attributes.get("href") or ""
+
+        # steam ID extraction
+        steam_id = None
+        if user_profile_link:
+            id_match = _RE_PROFILE_ID.search(user_profile_link)
+            if id_match:
+                steam_id = id_match.group(1)
+            else:
+                username_match = _RE_VANITY.search(user_profile_link)
+                if username_match:
+                    steam_id = username_match.group(1)
+
+        # comment text
+        comment_text_div = comment_element.css_first(_CSS_COMMENT_TEXT)
+        if comment_text_div is None:
+            comment_text_div = comment_element.css_first(_CSS_COMMENT_TEXT_FALLBACK)
+
+        # text nodes joined by a space so <br>-split lines stay separate words
+        comment_text = ""
+        if comment_text_div is not None:
+            comment_text = comment_text_div.text(strip=True, separator=" ").strip()
+
+        # skip empty comments
+        if not comment_text:
+            return None
+
+        # skip system messages
+        if "Это сообщение ещё не проанализировано нашей системой" in comment_text:
+            return None
+
+        # timestamp
+        timestamp_span = comment_element.css_first(_CSS_TIMESTAMP)
+        if timestamp_span is None:
+            timestamp_span = comment_element.css_first(_CSS_TIMESTAMP_FALLBACK)
+
+        timestamp = ""
+        if timestamp_span is not None:
+            timestamp = timestamp_span.attributes.get("title") or ""
+        if not timestamp and timestamp_span is not None:
+            timestamp = _text(timestamp_span)
+
+        # avatar
+        avatar_img = comment_element.css_first(_CSS_AVATAR_FASTLY)
+        if avatar_img is None:
+            avatar_img = comment_element.css_first(_CSS_AVATAR_ANY)
+
+        avatar_url = ""
+        if avatar_img is not None:
+            avatar_url = avatar_img.attributes.get("src") or ""
+
+        # online status
+        avatar_div = comment_element.css_first(_CSS_AVATAR_DIV)
+        status = "unknown"
+        if avatar_div is not None:
+            classes_str = avatar_div.attributes.get("class") or ""
+            if "online" in classes_str:
+                status = "online"
+            elif "offline" in classes_str:
+                status = "offline"
+            elif "in-game" in classes_str:
+                status = "in-game"
+
+        # comment ID
+        comment_id = comment_element.attributes.get("id") or ""
+        if comment_id.startswith("comment_"):
+            comment_id = comment_id.replace("comment_", "")
+
+        # generate ID if missing
+        if not comment_id:
+            text_digest = hashlib.blake2b(
+                comment_text.encode(), digest_size=8
+            ).hexdigest()
+            comment_id = f"{user_name}_{timestamp}_{text_digest}"
+
+        return (
+            user_name,
+            steam_id,
+            user_profile_link,
+            comment_text,
+            timestamp,
+            avatar_url,
+            status,
+            comment_id,
+            parsed_time,
+        )
+
+    except Exception as e:
+        print(f"comment parsing error: {e}")
+        return None
 
 
 class SteamProfileCommentParser:
@@ -27,12 +258,67 @@ class SteamProfileCommentParser:
             }
         )
 
-        self.comments_data = defaultdict(lambda: {"count": 0, "comments": []})
+        # keep-alive pool sized for concurrent page requests, retry transient errors
+        retries = Retry(
+            total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retries)
+        self.session.mount("https://", adapter)
+
+        # column store: one list per comment field instead of a dict per comment
+        self._columns = {field: [] for field in _COMMENT_FIELDS}
         self.total_comments = 0
         self.profile_url = None
-        self.comments_per_page = 50  # steam shows 50 comments per page
+        self.html_page_size = 50  # steam shows 50 comments per page
+        self.comments_per_page = self.html_page_size  # comments per fetched page
+        self.max_comments = None  # comment budget of the current parse
         self.base_comments_url = None
-        self.seen_comment_ids = set()  # track unique comments
+        self._page_url_prefix = None  # base_comments_url up to "p="
+        self.seen_comment_ids = set()  # track unique comments (int or str ids)
+        self.max_workers = 8  # concurrent page requests
+        self.parse_workers = os.cpu_count() or 1  # processes parsing page HTML
+        self.render_url = None  # JSON comment endpoint, preferred over HTML pages
+        self.render_page_size = 1000  # comments per render request
+
+    def group_by_user(
+        self, max_users: Optional[int] = None, max_comments: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Build the {user: {"count", "comments"}} view from the column store
+
+        Every returned comment is a new dict, so pass limits for partial
+        views instead of grouping the whole profile.
+
+        Args:
+            max_users: first N commenters only
+            max_comments: first N comments per user only
+
+        Returns:
+            dictionary with comment data grouped by user
+        """
+        grouped = {}
+        for user, indices in islice(self._user_row_indices().items(), max_users):
+            grouped[user] = {
+                "count": len(indices),
+                "comments": [self._comment_at(i) for i in indices[:max_comments]],
+            }
+        return grouped
+
+    def _user_row_indices(self) -> Dict[str, List[int]]:
+        """row indices of each user's comments, users in first-seen order"""
+        indices = {}
+        for i, user in enumerate(self._columns["user"]):
+            indices.setdefault(user, []).append(i)
+        return indices
+
+    def _comment_at(self, index: int) -> Dict[str, Any]:
+        """single comment dict from the column store"""
+        return {field: column[index] for field, column in self._columns.items()}
+
+    @property
+    def total_users(self) -> int:
+        """number of distinct commenters"""
+        return len(set(self._columns["user"]))
 
     def parse_profile(self, profile_url: str, max_pages: int = 200) -> Dict[str, Any]:
         """
@@ -40,61 +326,96 @@ class SteamProfileCommentParser:
 
         Args:
             profile_url: Steam profile URL
-            max_pages: maximum pages to parse
+            max_pages: maximum pages to parse, 50 comments each
 
         Returns:
-            dictionary with comment data
+            parsing summary (empty on failure)
         """
         self.profile_url = profile_url
         print(f"starting profile parsing: {profile_url}")
 
+        # paging state belongs to the previous profile
+        self.comments_per_page = self.html_page_size
+        self.max_comments = None
+        self.base_comments_url = None
+        self._page_url_prefix = None
+        self.render_url = None
+
         try:
             # load first page
             print("loading first page...")
             response = self.session.get(profile_url, timeout=30)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, "html.parser")
+            tree = LexborHTMLParser(_response_html(response))
 
             # get total comment count
-            total_comments = self._get_total_comments_count(soup)
+            total_comments = self._get_total_comments_count(tree)
             print(f"total comments according to steam: {total_comments}")
 
             if total_comments > 0:
-                # get all comments URL
-                all_comments_url = self._get_all_comments_url(soup, profile_url)
+                # prefer the JSON render endpoint: comment fragments only,
+                # up to 1000 per request instead of 50 per profile page
+                steam_id = self._get_steam_id(tree, profile_url)
+                if steam_id:
+                    self.render_url = f"https://steamcommunity.com/comment/Profile/render/{steam_id}/-1/"
+                    print(f"comments render URL: {self.render_url}")
+                else:
+                    # get all comments URL
+                    self.base_comments_url = self._get_all_comments_url(
+                        tree, profile_url
+                    )
+                    if self.base_comments_url:
+                        print(f"comments base URL: {self.base_comments_url}")
+                        self._page_url_prefix = self._build_page_url_prefix(
+                            self.base_comments_url
+                        )
 
-                if all_comments_url:
-                    self.base_comments_url = all_comments_url
-                    print(f"comments base URL: {all_comments_url}")
+                if self.render_url or self.base_comments_url:
 
-                    # calculate pages to parse
-                    total_pages = math.ceil(total_comments / self.comments_per_page)
+                    # max_pages is a budget of 50-comment pages in both modes
+                    self.max_comments = total_comments
                     if max_pages:
-                        total_pages = min(total_pages, max_pages)
+                        self.max_comments = min(
+                            total_comments, max_pages * self.html_page_size
+                        )
+
+                    # render requests carry up to 1000 comments each
+                    if self.render_url:
+                        self.comments_per_page = min(
+                            self.render_page_size, self.max_comments
+                        )
+
+                    # calculate pages to parse
+                    total_pages = math.ceil(self.max_comments / self.comments_per_page)
 
                     print(f"total pages to parse: {total_pages}")
 
                     # parse first page
                     print("parsing first page...")
-                    self._parse_comments_from_html(response.text)
+                    self._parse_comments_from_tree(tree)
 
-                    # parse remaining pages
-                    if total_pages > 1:
-                        self._parse_all_pages_optimized(total_pages)
+                    # parse remaining pages (render pages start at offset 0)
+                    first_page = 1 if self.render_url else 2
+                    if total_pages >= first_page:
+                        self._parse_all_pages_optimized(total_pages, first_page)
                 else:
                     # fallback to first page only
                     print("all comments link not found, parsing first page only...")
-                    self._parse_comments_from_html(response.text)
+                    self._parse_comments_from_tree(tree)
             else:
                 print("no comments to parse")
-                self._parse_comments_from_html(response.text)
+                self._parse_comments_from_tree(tree)
 
             print(f"\nparsing complete!")
             print(f"total comments parsed: {self.total_comments}")
-            print(f"total users: {len(self.comments_data)}")
+            print(f"total users: {self.total_users}")
 
-            return dict(self.comments_data)
+            return {
+                "profile_url": self.profile_url,
+                "total_users": self.total_users,
+                "total_comments": self.total_comments,
+            }
 
         except requests.RequestException as e:
             print(f"page load error: {e}")
@@ -106,38 +427,38 @@ class SteamProfileCommentParser:
             traceback.print_exc()
             return {}
 
-    def _get_total_comments_count(self, soup: BeautifulSoup) -> int:
+    def _get_total_comments_count(self, tree: LexborHTMLParser) -> int:
         """extract total comment count from page"""
         try:
             # method 1: look for InitializeCommentThread script
-            script_tags = soup.find_all("script")
-            for script in script_tags:
-                if script.string and "InitializeCommentThread" in script.string:
+            for script in tree.css("script"):
+                script_text = script.text()
+                if "InitializeCommentThread" in script_text:
                     pattern = (
                         r"InitializeCommentThread\s*\(\s*[^,]+,\s*[^,]+,\s*({[^}]+})"
                     )
-                    match = re.search(pattern, script.string, re.DOTALL)
+                    match = re.search(pattern, script_text, re.DOTALL)
                     if match:
                         try:
-                            data = json.loads(match.group(1))
+                            data = orjson.loads(match.group(1))
                             if "total_count" in data:
                                 return int(data["total_count"])
                         except:
                             pass
 
             # method 2: "All comments" link with count
-            all_comments_link = soup.find("a", class_="commentthread_allcommentslink")
-            if all_comments_link:
-                text = all_comments_link.get_text(strip=True)
+            all_comments_link = tree.css_first(_CSS_ALL_COMMENTS_LINK)
+            if all_comments_link is not None:
+                text = _text(all_comments_link)
                 match = re.search(r"\((\d+)\)", text)
                 if match:
                     return int(match.group(1))
 
             # method 3: element containing totalcount
-            totalcount_elem = soup.find(id=lambda x: x and "totalcount" in x)
-            if totalcount_elem:
+            totalcount_elem = tree.css_first(_CSS_TOTALCOUNT)
+            if totalcount_elem is not None:
                 try:
-                    return int(totalcount_elem.text.strip())
+                    return int(_text(totalcount_elem))
                 except:
                     pass
 
@@ -148,21 +469,23 @@ class SteamProfileCommentParser:
             return 0
 
     def _get_all_comments_url(
-        self, soup: BeautifulSoup, base_url: str
+        self, tree: LexborHTMLParser, base_url: str
     ) -> Optional[str]:
         """construct URL for all comments page"""
         try:
             # method 1: find "All comments" link
-            all_comments_link = soup.find("a", class_="commentthread_allcommentslink")
-            if all_comments_link and all_comments_link.get("href"):
-                href = all_comments_link.get("href")
+            all_comments_link = tree.css_first(_CSS_ALL_COMMENTS_LINK)
+            if all_comments_link is not None and all_comments_link.attributes.get(
+                "href"
+            ):
+                href = all_comments_link.attributes["href"]
                 return self._normalize_url(href, base_url)
 
             # method 2: extract from profile data
-            steamid_match = re.search(r"g_rgProfileData\s*=\s*({[^}]+})", soup.text)
+            steamid_match = _RE_PROFILE_DATA.search(tree.text())
             if steamid_match:
                 try:
-                    profile_data = json.loads(steamid_match.group(1))
+                    profile_data = orjson.loads(steamid_match.group(1))
                     steamid = profile_data.get("steamid")
                     if steamid:
                         return (
@@ -173,11 +496,11 @@ class SteamProfileCommentParser:
 
             # method 3: construct from URL pattern
             if "/profiles/" in base_url:
-                match = re.search(r"/profiles/(\d+)", base_url)
+                match = _RE_PROFILE_ID.search(base_url)
                 if match:
                     return f"https://steamcommunity.com/profiles/{match.group(1)}/allcomments"
             elif "/id/" in base_url:
-                match = re.search(r"/id/([^/]+)", base_url)
+                match = _RE_VANITY.search(base_url)
                 if match:
                     return f"https://steamcommunity.com/id/{match.group(1)}/allcomments"
 
@@ -187,6 +510,25 @@ class SteamProfileCommentParser:
             print(f"error getting comments URL: {e}")
             return None
 
+    def _get_steam_id(self, tree: LexborHTMLParser, base_url: str) -> Optional[str]:
+        """extract numeric steam ID of the profile owner"""
+        # method 1: profile data script
+        for script in tree.css("script"):
+            script_text = script.text()
+            if "g_rgProfileData" in script_text:
+                match = _RE_PROFILE_DATA.search(script_text)
+                if match:
+                    try:
+                        steamid = orjson.loads(match.group(1)).get("steamid")
+                        if steamid:
+                            return steamid
+                    except ValueError:
+                        pass
+
+        # method 2: /profiles/<id> URL
+        match = _RE_PROFILE_ID.search(base_url)
+        return match.group(1) if match else None
+
     def _normalize_url(self, url: str, base_url: str) -> str:
         """normalize relative URLs to absolute"""
         if url.startswith("/"):
@@ -196,247 +538,190 @@ class SteamProfileCommentParser:
             return urljoin(base_url, url)
         return url
 
-    def _parse_all_pages_optimized(self, total_pages: int):
-        """parse all pages with duplicate detection"""
+    def _parse_all_pages_optimized(self, total_pages: int, first_page: int = 2):
+        """parse all pages concurrently with duplicate detection"""
         print(f"\nstarting to parse {total_pages} pages...")
         no_new_comments_pages = 0
 
-        # start from page 2 (page 1 already parsed)
-        for page_num in range(2, total_pages + 1):
-            try:
-                page_url = self._get_page_url(page_num)
-
-                # rate limiting
-                time.sleep(0.5)
-
-                print(f"page {page_num}/{total_pages}...", end="\r")
-
-                response = self.session.get(page_url, timeout=30)
-                response.raise_for_status()
+        # ids known before fetching (landing page): workers skip those blocks
+        skip_ids = frozenset(self.seen_comment_ids)
+
+        # a process pool costs more to start than parsing a single page,
+        # so only fan out when there are several pages to parse
+        parse_pool = None
+        if total_pages - first_page + 1 > 1 and self.parse_workers > 1:
+            # workers start while fetch threads run, so never fork() this process:
+            # forkserver where available, the platform default (spawn) elsewhere
+            mp_context = None
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                mp_context = multiprocessing.get_context("forkserver")
+
+            parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers, mp_context=mp_context
+            )
 
-                # parse comments
-                comments_count = self._parse_comments_from_html(response.text)
+        with parse_pool or nullcontext(), ThreadPoolExecutor(
+            max_workers=self.max_workers
+        ) as executor:
+            # HTML pages start from 2 (page 1 already parsed)
+            futures = {
+                page_num: executor.submit(
+                    self._fetch_and_parse_page,
+                    self._get_page_url(page_num),
+                    parse_pool,
+                    skip_ids,
+                )
+                for page_num in range(first_page, total_pages + 1)
+            }
 
-                # stop if no new comments for 2 consecutive pages
-                if comments_count == 0:
-                    no_new_comments_pages += 1
-                    if no_new_comments_pages >= 2:
+            try:
+                # consume in page order so consecutive empty pages are detected
+                last_progress = 0.0
+                for page_num, future in futures.items():
+                    # progress line at most twice a second, terminal writes are slow
+                    now = time.monotonic()
+                    if now - last_progress >= 0.5:
+                        last_progress = now
                         print(
-                            f"\nstopping: {no_new_comments_pages} pages without new comments"
+                            f"page {page_num}/{total_pages}, "
+                            f"comments parsed: {self.total_comments}...",
+                            end="\r",
                         )
-                        break
-                else:
-                    no_new_comments_pages = 0
 
-                time.sleep(0.2)
+                    try:
+                        comments_count = self._add_comments(future.result())
+                    except requests.RequestException as e:
+                        print(f"\nerror loading page {page_num}: {e}")
+                        continue
+                    except Exception as e:
+                        print(f"\nerror parsing page {page_num}: {e}")
+                        continue
 
-            except requests.RequestException as e:
-                print(f"\nerror loading page {page_num}: {e}")
-                continue
-            except Exception as e:
-                print(f"\nerror parsing page {page_num}: {e}")
-                continue
+                    # stop if no new comments for 2 consecutive pages
+                    if comments_count == 0:
+                        no_new_comments_pages += 1
+                        if no_new_comments_pages >= 2:
+                            print(
+                                f"\nstopping: {no_new_comments_pages} pages without new comments"
+                            )
+                            break
+                    else:
+                        no_new_comments_pages = 0
+            finally:
+                # drop queued fetches on any exit: early stop, errors, Ctrl+C
+                executor.shutdown(wait=True, cancel_futures=True)
 
         print("\n" + " " * 50)
 
+    def _fetch_and_parse_page(
+        self,
+        page_url: str,
+        parse_pool: Optional[ProcessPoolExecutor],
+        skip_ids: FrozenSet,
+    ) -> List[tuple]:
+        """download page in this thread, parse it in a worker process if pooled"""
+        html_content = self._fetch_page(page_url)
+        if parse_pool is None:
+            return parse_page(html_content, skip_ids)
+        return parse_pool.submit(parse_page, html_content, skip_ids).result()
+
+    def _fetch_page(self, page_url: str) -> Union[str, bytes]:
+        """download single comments page"""
+        response = self.session.get(page_url, timeout=30)
+        response.raise_for_status()
+
+        # render endpoint wraps the comment markup in JSON
+        if self.render_url:
+            return orjson.loads(response.content).get("comments_html", "")
+        return _response_html(response)
+
     def _get_page_url(self, page_num: int) -> str:
         """generate URL for specific page number"""
-        if not self.base_comments_url:
-            return ""
+        if self.render_url:
+            start = (page_num - 1) * self.comments_per_page
+            count = min(self.comments_per_page, self.max_comments - start)
+            return f"{self.render_url}?start={start}&count={count}&feature2=-1"
 
-        parsed_url = urlparse(self.base_comments_url)
-        query_params = parse_qs(parsed_url.query)
+        if not self._page_url_prefix:
+            return ""
 
-        # return original URL for page 1 if no 'p' parameter
-        if page_num == 1 and "p" not in query_params:
-            return self.base_comments_url
+        return f"{self._page_url_prefix}{page_num}"
 
-        # add/update page parameter
-        query_params["p"] = [str(page_num)]
+    def _build_page_url_prefix(self, url: str) -> str:
+        """split URL once into everything before the page number"""
+        parsed_url = urlparse(url)
+        query_params = parse_qs(parsed_url.query)
+        query_params.pop("p", None)
 
-        # reconstruct URL
+        # reconstruct URL without page parameter, then append an empty one
         new_query = urlencode(query_params, doseq=True)
-        new_url = parsed_url._replace(query=new_query).geturl()
-
-        return new_url
+        prefix = parsed_url._replace(query=new_query, fragment="").geturl()
 
-    def _parse_comments_from_html(self, html_content: str) -> int:
-        """parse comments from HTML with uniqueness check"""
-        soup = BeautifulSoup(html_content, "html.parser")
+        return prefix + ("&" if new_query else "?") + "p="
 
-        # find comment blocks
-        comment_blocks = soup.find_all("div", class_="commentthread_comment")
-
-        # fallback for alternative class names
-        if not comment_blocks:
-            comment_blocks = soup.find_all(
-                "div", class_=lambda x: x and "comment" in x.lower()
-            )
+    def _parse_comments_from_tree(self, tree: LexborHTMLParser) -> int:
+        """parse comments from an already parsed page"""
+        return self._add_comments(_parse_tree(tree))
 
+    def _add_comments(self, rows: List[tuple]) -> int:
+        """merge parsed rows with uniqueness check"""
         comments_count = 0
-
-        for comment in comment_blocks:
-            try:
-                comment_data = self._parse_single_comment(comment)
-                if comment_data:
-                    # skip empty comments
-                    if (
-                        not comment_data.get("comment_text")
-                        or not comment_data["comment_text"].strip()
-                    ):
-                        continue
-
-                    # skip system messages
-                    if (
-                        "Это сообщение ещё не проанализировано нашей системой"
-                        in comment_data["comment_text"]
-                    ):
-                        continue
-
-                    comment_id = comment_data["comment_id"]
-
-                    # skip already seen comments
-                    if comment_id in self.seen_comment_ids:
-                        continue
-
-                    # mark as seen
-                    self.seen_comment_ids.add(comment_id)
-
-                    user = comment_data["user"]
-                    self.comments_data[user]["count"] += 1
-                    self.comments_data[user]["comments"].append(comment_data)
-                    self.total_comments += 1
-                    comments_count += 1
-
-                    # progress indicator
-                    if self.total_comments % 50 == 0:
-                        print(f"comments parsed: {self.total_comments}", end="\r")
-
-            except Exception:
-                continue
+        for row in rows:
+            if self._add_comment(row):
+                comments_count += 1
 
         return comments_count
 
-    def _parse_single_comment(self, comment_element) -> Optional[Dict[str, Any]]:
-        """parse single comment element"""
-        try:
-            # username
-            user_link = comment_element.find("a", class_="commentthread_author_link")
-            if not user_link:
-                user_link = comment_element.find(
-                    "a", href=lambda x: x and ("/profiles/" in x or "/id/" in x)
-                )
-                if not user_link:
-                    return None
-
-            user_name = user_link.get_text(strip=True)
-
-            # profile URL
-            user_profile_link = user_link.get("href", "")
+    def _add_comment(self, row: tuple) -> bool:
+        """append row to the column store unless already seen"""
+        seen_key = _seen_key(row[_COMMENT_ID_INDEX])
 
-            # steam ID extraction
-            steam_id = None
-            if user_profile_link:
-                id_match = re.search(r"/profiles/(\d+)", user_profile_link)
-                if id_match:
-                    steam_id = id_match.group(1)
-                else:
-                    username_match = re.search(r"/id/([^/]+)", user_profile_link)
-                    if username_match:
-                        steam_id = username_match.group(1)
-
-            # comment text
-            comment_text_div = comment_element.find(
-                "div", class_="commentthread_comment_text"
-            )
-            if not comment_text_div:
-                comment_text_div = comment_element.find(
-                    "div", class_=lambda x: x and "text" in x.lower()
-                )
-
-            comment_text = (
-                comment_text_div.get_text(strip=True) if comment_text_div else ""
-            )
-
-            # timestamp
-            timestamp_span = comment_element.find(
-                "span", class_="commentthread_comment_timestamp"
-            )
-            if not timestamp_span:
-                timestamp_span = comment_element.find(
-                    "span", class_=lambda x: x and "timestamp" in x.lower()
-                )
-
-            timestamp = timestamp_span.get("title", "") if timestamp_span else ""
-            if not timestamp and timestamp_span:
-                timestamp = timestamp_span.get_text(strip=True)
-
-            # avatar
-            avatar_img = comment_element.find(
-                "img", src=re.compile(r"avatars\.fastly\.steamstatic\.com")
-            )
-            if not avatar_img:
-                avatar_img = comment_element.find(
-                    "img", src=re.compile(r"steamstatic\.com")
-                )
-
-            avatar_url = avatar_img.get("src", "") if avatar_img else ""
+        # skip already seen comments
+        if seen_key in self.seen_comment_ids:
+            return False
 
-            # online status
-            avatar_div = comment_element.find(
-                "div", class_=re.compile(r"commentthread_comment_avatar|playerAvatar")
-            )
-            status = "unknown"
-            if avatar_div:
-                classes = avatar_div.get("class", [])
-                classes_str = " ".join(classes)
-                if "online" in classes_str:
-                    status = "online"
-                elif "offline" in classes_str:
-                    status = "offline"
-                elif "in-game" in classes_str:
-                    status = "in-game"
-
-            # comment ID
-            comment_id = comment_element.get("id", "")
-            if comment_id.startswith("comment_"):
-                comment_id = comment_id.replace("comment_", "")
-
-            # generate ID if missing
-            if not comment_id:
-                comment_id = f"{user_name}_{timestamp}_{hash(comment_text) % 1000000}"
-
-            # parse time
-            parsed_time = datetime.now().isoformat()
+        # mark as seen
+        self.seen_comment_ids.add(seen_key)
 
-            return {
-                "user": user_name,
-                "steam_id": steam_id,
-                "profile_url": user_profile_link,
-                "comment_text": comment_text,
-                "timestamp": timestamp,
-                "avatar_url": avatar_url,
-                "status": status,
-                "comment_id": comment_id,
-                "parsed_time": parsed_time,
-            }
+        # per-user fields repeat across comments, share one string each
+        for column, value, intern in zip(self._columns.values(), row, _INTERN_MASK):
+            column.append(sys.intern(value) if intern and value else value)
+        self.total_comments += 1
 
-        except Exception as e:
-            print(f"comment parsing error: {e}")
-            return None
+        return True
 
     def save_to_json(self, filename: str = "steam_comments.json") -> Dict[str, Any]:
-        """save results to JSON file"""
+        """save results to JSON file, returns the summary fields"""
         result = {
             "profile_url": self.profile_url,
-            "total_users": len(self.comments_data),
+            "total_users": self.total_users,
             "total_comments": self.total_comments,
             "parse_date": datetime.now().isoformat(),
-            "data": dict(self.comments_data),
         }
+        option = orjson.OPT_INDENT_2
+
+        with open(filename, "wb") as f:
+            # summary without its closing "\n}", then "data" streamed one user
+            # at a time so only that user's comment dicts exist at once
+            f.write(orjson.dumps(result, option=option)[:-2])
+            f.write(b',\n  "data": {')
+
+            separator = b"\n    "
+            user_indices = self._user_row_indices()
+            for user, indices in user_indices.items():
+                user_data = {
+                    "count": len(indices),
+                    "comments": [self._comment_at(i) for i in indices],
+                }
+                f.write(separator)
+                f.write(orjson.dumps(user))
+                f.write(b": ")
+                f.write(
+                    orjson.dumps(user_data, option=option).replace(b"\n", b"\n    ")
+                )
+                separator = b",\n    "
 
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+            f.write(b"\n  }\n}" if user_indices else b"}\n}")
 
         print(f"\nsaved to JSON file: {filename}")
         return result
@@ -448,38 +733,8 @@ class SteamProfileCommentParser:
 
             with open(filename, "w", newline="", encoding="utf-8") as f:
                 writer = csv.writer(f)
-
-                # headers
-                writer.writerow(
-                    [
-                        "user",
-                        "steam_id",
-                        "profile_url",
-                        "comment_text",
-                        "timestamp",
-                        "avatar_url",
-                        "status",
-                        "comment_id",
-                        "parsed_time",
-                    ]
-                )
-
-                # data rows
-                for user_data in self.comments_data.values():
-                    for comment in user_data["comments"]:
-                        writer.writerow(
-                            [
-                                comment.get("user", ""),
-                                comment.get("steam_id", ""),
-                                comment.get("profile_url", ""),
-                                comment.get("comment_text", ""),
-                                comment.get("timestamp", ""),
-                                comment.get("avatar_url", ""),
-                                comment.get("status", ""),
-                                comment.get("comment_id", ""),
-                                comment.get("parsed_time", ""),
-                            ]
-                        )
+                writer.writerow(_COMMENT_FIELDS)
+                writer.writerows(zip(*self._columns.values()))
 
             print(f"saved to CSV file: {filename}")
 
@@ -495,15 +750,13 @@ class SteamProfileCommentParser:
         print("=" * 60)
         print(f"profile: {self.profile_url}")
         print(f"total comments: {self.total_comments}")
-        print(f"total users: {len(self.comments_data)}")
+        print(f"total users: {self.total_users}")
 
-        if self.comments_data:
+        if self.total_comments:
             print(f"\ntop-{top_n} users by comment count:")
             print("-" * 60)
 
-            sorted_users = sorted(
-                self.comments_data.items(), key=lambda x: x[1]["count"], reverse=True
-            )[:top_n]
+            top_users = Counter(self._columns["user"]).most_common(top_n)
 
-            for i, (user, data) in enumerate(sorted_users, 1):
-                print(f"{i:3}. {user[:40]:40} - {data['count']:5} comments")
+            for i, (user, count) in enumerate(top_users, 1):
+                print(f"{i:3}. {user[:40]:40} - {count:5} comments")